@@ -18,10 +18,9 @@ from src.utils.logger import log
 
 async def test_batch_data():
     """Test batch data retrieval for multiple stocks."""
+    # 创建适配器实例
+    adapter = AKShareAdapter()
     try:
-        # 创建适配器实例
-        adapter = AKShareAdapter()
-        
         # 测试股票列表：白酒股
         symbols = [
             "600519.SH",  # 贵州茅台
@@ -52,8 +51,9 @@ async def test_batch_data():
             
             # 分析数据
             print(f"\n{period.value}数据统计:")
-            # 按股票分组统计
-            stats = df.groupby('symbol').agg({
+            # 按股票分组统计(统计与计数共用同一个分组)
+            grouped = df.groupby('symbol', sort=False, observed=True)
+            stats = grouped.agg({
                 'open': ['mean', 'min', 'max'],
                 'volume': 'sum',
                 'amount': 'sum'
@@ -62,7 +62,7 @@ async def test_batch_data():
             print(stats)
             
             # 计算每只股票的数据条数
-            counts = df.groupby('symbol').size()
+            counts = grouped.size()
             print("\n每只股票的数据条数:")
             print(counts)
             
@@ -72,6 +72,8 @@ async def test_batch_data():
     except Exception as e:
         log.error(f"测试失败: {str(e)}")
         raise
+    finally:
+        adapter.close()
 
 
 if __name__ == '__main__':
@@ -50,8 +50,8 @@ async def test_period(adapter: AKShareAdapter, symbol: str, period: Period):
 
 async def main():
     """Main function to test different period data."""
+    adapter = AKShareAdapter()
     try:
-        adapter = AKShareAdapter()
         symbol = "600887.SH"  # 伊利股份
         
         # 测试不同周期的数据
@@ -62,6 +62,8 @@ async def main():
     except Exception as e:
         log.error(f"测试失败: {str(e)}")
         raise
+    finally:
+        adapter.close()
 
 
 if __name__ == '__main__':
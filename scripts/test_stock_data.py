@@ -44,7 +44,10 @@ async def main():
         log.info("\n使用适配器获取数据")
         adapter = AKShareAdapter()
         symbol_with_suffix = f"{symbol}.SH"
-        df = await adapter.get_daily_data(symbol_with_suffix, start_date, end_date)
+        try:
+            df = await adapter.get_daily_data(symbol_with_suffix, start_date, end_date)
+        finally:
+            adapter.close()
         
         print("\n适配器处理后的数据预览:")
         print(df.head())
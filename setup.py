@@ -7,6 +7,8 @@ setup(
     install_requires=[
         "akshare",
         "pandas",
+        "pyarrow",
+        "requests",
         "pytest",
         "pytest-asyncio",
         "pytest-cov",
@@ -24,6 +24,13 @@ DATA_SOURCE_CONFIG: Dict[str, Any] = {
         "retry_count": 3,
         "retry_delay": 1,
         "timeout": 30,
+        "stock_list_ttl": 24 * 60 * 60,  # 股票列表内存缓存时间(秒)
+        "stock_info_ttl": 24 * 60 * 60,  # 个股信息内存缓存时间(秒)
+        "memory_cache_size": 128,  # 历史数据进程内LRU缓存条数
+        "memory_cache_ttl": 60 * 60,  # 历史数据进程内缓存时间(秒)
+        "pooled_session": False,  # AKShare请求复用带连接池的Session(按线程)
+        "http_pool_size": 10,  # HTTP连接池大小
+        "max_workers": 16,  # 执行AKShare同步请求的线程数
     },
     "futu": {
         "host": os.getenv("FUTU_HOST", "127.0.0.1"),
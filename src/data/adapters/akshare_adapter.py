@@ -1,15 +1,23 @@
 """
 AKShare adapter for Chinese A-share market data.
 """
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Optional, Tuple, Callable, Union
 import asyncio
+import sys
+import threading
+import time
+import numpy as np
 import pandas as pd
 import akshare as ak
-from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from ..cache.cache_manager import CacheManager
-import re
 import logging
 
 from .base_adapter import MarketDataAdapter
@@ -19,6 +27,92 @@ from ...config.settings import DATA_SOURCE_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# 股票代码前三位 -> 交易所后缀
+_PREFIX_TO_EXCHANGE = {p: 'SH' for p in ('600', '601', '603', '605', '688')}  # 上海证券交易所
+_PREFIX_TO_EXCHANGE.update({p: 'SZ' for p in ('000', '001', '002', '003', '300', '301')})  # 深圳证券交易所
+_EXCHANGE_SUFFIXES = ('SH', 'SZ')
+
+
+@lru_cache(maxsize=8192)
+def _is_cn_symbol(symbol: str) -> bool:
+    """判断是否为 ^\\d{6}\\.(SH|SZ)$ 格式的A股代码
+    
+    用几次字符串比较代替正则；同一批股票代码会被反复校验，结果按代码缓存。
+    """
+    return (len(symbol) == 9 and symbol[6] == '.'
+            and symbol[7:] in _EXCHANGE_SUFFIXES
+            and symbol.isascii() and symbol[:6].isdigit())
+
+
+# 字符串列使用Arrow存储，避免逐行Python对象开销
+_STRING_DTYPE = pd.StringDtype('pyarrow')
+
+
+class _PooledRequests:
+    """AKShare模块内 requests 的替身
+    
+    get/post/request 走带连接池的Session，其余属性转发给真正的 requests 模块。
+    Session不是线程安全的，因此每个线程各自持有一个。
+    """
+    
+    def __init__(self, pool_size: int, retry_count: int, retry_delay: float):
+        self._pool_size = pool_size
+        self._retry = Retry(total=retry_count, backoff_factor=retry_delay)
+        self._local = threading.local()
+    
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            http_adapter = HTTPAdapter(
+                pool_connections=self._pool_size,
+                pool_maxsize=self._pool_size,
+                max_retries=self._retry
+            )
+            session.mount('http://', http_adapter)
+            session.mount('https://', http_adapter)
+            self._local.session = session
+        return session
+    
+    def request(self, method, url, **kwargs):
+        return self._session().request(method, url, **kwargs)
+    
+    def get(self, url, params=None, **kwargs):
+        return self._session().get(url, params=params, **kwargs)
+    
+    def post(self, url, data=None, json=None, **kwargs):
+        return self._session().post(url, data=data, json=json, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+# 已安装到AKShare模块的替身(进程内只安装一次)
+_pooled_requests: Optional[_PooledRequests] = None
+
+
+def _install_http_session(pool_size: int, retry_count: int, retry_delay: float) -> None:
+    """让AKShare的HTTP请求复用带连接池的Session
+    
+    AKShare没有提供注入Session的接口，各接口直接调用 requests.get/post，
+    每次请求都要重新建立TCP+TLS连接。这里只替换已加载的 akshare 子模块里的
+    requests 引用，不改动全局的 requests 模块，进程内其他代码不受影响。
+    
+    Args:
+        pool_size: 连接池大小
+        retry_count: 连接失败重试次数
+        retry_delay: 重试退避系数(秒)
+    """
+    global _pooled_requests
+    if _pooled_requests is not None:
+        return
+    
+    _pooled_requests = _PooledRequests(pool_size, retry_count, retry_delay)
+    for name, module in list(sys.modules.items()):
+        if (name == 'akshare' or name.startswith('akshare.')) \
+                and getattr(module, 'requests', None) is requests:
+            module.requests = _pooled_requests
+
 class Period(Enum):
     """Data period types."""
     DAILY = "daily"
@@ -26,6 +120,10 @@ class Period(Enum):
     MONTHLY = "monthly"
 
 
+# 周期 -> AKShare/缓存使用的字符串，热路径上避免反复访问Enum属性
+_PERIOD_STR = {p: p.value for p in Period}
+
+
 class AKShareAdapter(MarketDataAdapter):
     """Adapter for retrieving A-share market data using AKShare."""
     
@@ -44,36 +142,112 @@ class AKShareAdapter(MarketDataAdapter):
         '换手率': 'turnover'
     }
     
+    # 实时行情原始列 -> MarketData字段
+    _SPOT_COLUMN_MAP = {
+        '开盘': 'open',
+        '最高': 'high',
+        '最低': 'low',
+        '最新价': 'close',
+        '成交量': 'volume',
+        '成交额': 'amount'
+    }
+    
+    # 历史K线的原始列与输出列(一一对应)
+    _RAW_COLS = ['日期', '开盘', '最高', '最低', '收盘', '成交量', '成交额']
+    _OUT_COLS = ['date', 'open', 'high', 'low', 'close', 'volume', 'amount']
+    # A股价格精确到0.01元且远小于1万，float32精度足够，内存减半；
+    # 成交额可超过1e12，保留float64(AKShare有时返回整数，统一类型)
+    _OUT_DTYPES = {
+        'open': np.float32,
+        'high': np.float32,
+        'low': np.float32,
+        'close': np.float32,
+        'volume': np.int64,
+        'amount': np.float64,
+    }
+    
     def __init__(self):
         """Initialize the AKShare adapter."""
         super().__init__(market='CN')
         self.config = DATA_SOURCE_CONFIG['akshare']
         self.cache = CacheManager()
+        # AKShare接口均为同步HTTP请求，使用专用线程池执行，
+        # 与默认线程池隔离并可按上游限流调整并发数
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config['max_workers'],
+            thread_name_prefix='akshare'
+        )
+        if self.config['pooled_session']:
+            _install_http_session(
+                pool_size=self.config['http_pool_size'],
+                retry_count=self.config['retry_count'],
+                retry_delay=self.config['retry_delay']
+            )
+        # 股票列表内存缓存: (获取时间, 股票列表)
+        self._stock_list_cache: Optional[Tuple[float, List[StockInfo]]] = None
+        self._stock_list_lock = asyncio.Lock()
+        # 个股信息内存缓存: symbol -> (获取时间, StockInfo)
+        self._stock_info_cache: Dict[str, Tuple[float, StockInfo]] = {}
+        # 历史数据进程内LRU缓存，避免重复查询时读取SQLite并反序列化: key -> (写入时间, 数据)
+        self._mem_cache: 'OrderedDict[Tuple[str, ...], Tuple[float, pd.DataFrame]]' = OrderedDict()
+        self._mem_cache_max = self.config['memory_cache_size']
+    
+    def close(self) -> None:
+        """释放线程池与缓存连接"""
+        self._executor.shutdown(wait=True)
+        self.cache.close()
         
-    @lru_cache(maxsize=1)
     async def get_stock_list(self) -> List[StockInfo]:
         """Get list of all A-share stocks.
         
+        The list is fetched once and kept in memory until it is older than
+        ``stock_list_ttl`` seconds.
+        
         Returns:
             List of StockInfo objects
         """
+        # 缓存有效时直接返回，无需获取锁
+        stocks = self._fresh_stock_list()
+        if stocks is not None:
+            return stocks
+        
+        # 并发调用在锁上排队，只有第一个会真正请求数据，其余复用其结果
+        async with self._stock_list_lock:
+            stocks = self._fresh_stock_list()
+            if stocks is None:
+                stocks = await self._fetch_stock_list()
+                self._stock_list_cache = (time.monotonic(), stocks)
+            return stocks
+    
+    def _fresh_stock_list(self) -> Optional[List[StockInfo]]:
+        """返回未过期的缓存股票列表，没有缓存或已过期时返回None"""
+        cached = self._stock_list_cache
+        if cached is None or time.monotonic() - cached[0] > self.config['stock_list_ttl']:
+            return None
+        return cached[1]
+    
+    async def _fetch_stock_list(self) -> List[StockInfo]:
+        """从AKShare获取A股列表(内部方法)"""
         try:
             # 获取A股列表
-            df = ak.stock_info_a_code_name()
-            
-            stocks = []
-            for _, row in df.iterrows():
-                stock_info = StockInfo(
-                    symbol=f"{row['code']}.{self._get_exchange_suffix(row['code'])}",
-                    name=row['name'],
-                    market=self.market
-                )
-                stocks.append(stock_info)
+            df = await self._run_blocking(ak.stock_info_a_code_name)
+            
+            # 向量化计算交易所后缀，避免逐行iterrows
+            codes = df['code'].astype(str)
+            suffixes = codes.str[:3].map(_PREFIX_TO_EXCHANGE)
+            unknown = suffixes.isna()
+            if unknown.any():
+                raise ValueError(f"Unknown exchange for stock code: {codes[unknown].iloc[0]}")
             
-            log.debug(f"\n[DEBUG] 股票列表获取成功，共{len(stocks)}只股票")
-            log.debug("\n[DEBUG] 股票列表:")
-            for stock in stocks:
-                log.debug(stock.symbol)
+            # tolist() 得到原生str列表，逐个构造时无需从ndarray装箱
+            symbols = (codes + '.' + suffixes).tolist()
+            names = df['name'].tolist()
+            stocks = [
+                StockInfo(symbol=symbol, name=name, market=self.market)
+                for symbol, name in zip(symbols, names)
+            ]
+            
+            log.debug("股票列表获取成功，共{}只股票", len(stocks))
             
             return stocks
             
@@ -86,44 +260,65 @@ class AKShareAdapter(MarketDataAdapter):
         Args:
             symbol: Stock symbol (e.g., '000001.SZ')
             
+        Industry and listing date rarely change, so results are kept in memory
+        for ``stock_info_ttl`` seconds.
+        
         Returns:
             StockInfo object with detailed information
         """
         try:
             self._validate_symbol(symbol)
             
+            cached = self._stock_info_cache.get(symbol)
+            if cached is not None and time.monotonic() - cached[0] <= self.config['stock_info_ttl']:
+                return cached[1]
+            
             # 移除市场后缀
             code = self._format_symbol(symbol)
             
             # 获取股票详细信息
-            df = ak.stock_individual_info_em(code)
+            df = await self._run_blocking(ak.stock_individual_info_em, code)
             
             # 转换为字典
-            info_dict = df.set_index('item').to_dict()['value']
+            info_dict = dict(zip(df['item'].to_numpy(), df['value'].to_numpy()))
             
-            log.debug(f"\n[DEBUG] 股票{symbol}详细信息获取成功")
-            log.debug("\n[DEBUG] 股票详细信息:")
-            for key, value in info_dict.items():
-                log.debug(f"{key}: {value}")
+            log.debug("股票{}详细信息获取成功: {}", symbol, info_dict)
             
-            return StockInfo(
+            stock_info = StockInfo(
                 symbol=symbol,
                 name=info_dict.get('名称', ''),
                 market=self.market,
                 industry=info_dict.get('行业', None),
-                list_date=datetime.strptime(info_dict.get('上市日期', ''), '%Y-%m-%d')
-                if info_dict.get('上市日期') else None
+                list_date=self._parse_list_date(info_dict.get('上市日期'))
             )
+            self._stock_info_cache[symbol] = (time.monotonic(), stock_info)
+            return stock_info
             
         except Exception as e:
             self._handle_error(e, f"Failed to get stock info for {symbol}")
     
+    @staticmethod
+    def _parse_list_date(value: Any) -> Optional[datetime]:
+        """解析上市日期(内部方法)
+        
+        AKShare返回YYYYMMDD整数或YYYY-MM-DD字符串，按长度选择固定格式解析；
+        无法解析时返回None，避免个股信息因该字段整体失败。
+        """
+        if not value:
+            return None
+        text = str(value)
+        try:
+            return datetime.strptime(text, '%Y%m%d' if len(text) == 8 else '%Y-%m-%d')
+        except ValueError:
+            log.warning("无法解析上市日期: {}", value)
+            return None
+    
     async def get_historical_data(
         self,
         symbol: str,
         period: Period,
-        start_date: str,
-        end_date: str,
+        start_date: Union[str, datetime],
+        end_date: Union[str, datetime],
         adjust_type: str = 'qfq'
     ) -> pd.DataFrame:
         """获取历史K线数据
@@ -131,62 +326,246 @@ class AKShareAdapter(MarketDataAdapter):
         Args:
             symbol: 股票代码
             period: 数据周期
-            start_date: 开始日期 (YYYYMMDD)
-            end_date: 结束日期 (YYYYMMDD)
+            start_date: 开始日期 (YYYYMMDD或datetime)
+            end_date: 结束日期 (YYYYMMDD或datetime)
             adjust_type: 复权类型, 默认前复权
             
         Returns:
             DataFrame包含历史数据
         """
         try:
-            # 尝试从缓存获取数据
+            start_date = self._to_date_str(start_date)
+            end_date = self._to_date_str(end_date)
+            period_str = _PERIOD_STR[period]
+            
+            # 尝试从缓存获取数据: 先查内存，再查本地缓存
+            mem_key = (symbol, period_str, start_date, end_date, adjust_type)
+            cached_data = self._mem_get(mem_key)
+            if cached_data is not None:
+                return cached_data
+            
             cached_data = self.cache.get_data(
-                symbol, period.value, start_date, end_date
+                symbol, period_str, start_date, end_date, adjust_type
             )
             if cached_data is not None:
-                return cached_data
+                self._mem_put(mem_key, cached_data)
+                return cached_data.copy(deep=False)
+            
+            # 只有日K能利用重叠区间的缓存，周/月K不必读取
+            cached_range = None
+            if period is Period.DAILY:
+                cached_range = self.cache.get_overlapping_data(
+                    symbol, period_str, start_date, end_date, adjust_type
+                )
 
             self._validate_symbol(symbol)
             
-            log.debug(f"开始获取数据...")
-            log.debug(f"参数: symbol={symbol}, period={period.value}, "
-                      f"start_date={start_date}, end_date={end_date}, adjust={adjust_type}")
+            df = None
+            if cached_range is not None:
+                df = await self._extend_cached_range(
+                    symbol, period, start_date, end_date, adjust_type, *cached_range
+                )
             
-            df = ak.stock_zh_a_hist(
-                symbol=self._format_symbol(symbol),
-                period=period.value,
-                start_date=start_date,
-                end_date=end_date,
-                adjust=adjust_type
-            )
+            if df is None:
+                df = await self._fetch_hist_df(symbol, period, start_date, end_date, adjust_type)
+                # 保存到缓存
+                if not df.empty:
+                    self.cache.save_data(
+                        symbol, period_str, start_date, end_date, df, adjust_type
+                    )
             
             if df.empty:
                 raise ValueError(f"获取数据为空: {symbol}")
-                
-            # 标准化数据格式
-            df = df.rename(columns=self.COLUMN_MAP)
-            df['date'] = pd.to_datetime(df['date']).apply(lambda x: x.strftime('%Y%m%d'))
-            df = df[['date', 'open', 'high', 'low', 'close', 'volume', 'amount']]
-            df = df.sort_values('date')
-            df['symbol'] = symbol
-            
-            # 保存到缓存
-            self.cache.save_data(
-                symbol, period.value, start_date, end_date, df
-            )
             
-            return df
+            self._mem_put(mem_key, df)
+            return df.copy(deep=False)
             
         except Exception as e:
             log.error(f"获取历史数据出错: {str(e)}")
             raise
 
-    async def get_batch_historical_data(
+    async def _fetch_hist_df(
         self,
-        symbols: List[str],
+        symbol: str,
         period: Period,
         start_date: str,
         end_date: str,
+        adjust_type: str
+    ) -> pd.DataFrame:
+        """从AKShare获取并标准化历史K线(内部方法)
+        
+        Returns:
+            标准化后的DataFrame，区间内无数据时为空DataFrame
+        """
+        period_str = _PERIOD_STR[period]
+        log.debug("开始获取数据: symbol={}, period={}, start_date={}, end_date={}, adjust={}",
+                  symbol, period_str, start_date, end_date, adjust_type)
+        
+        df = await self._run_blocking(
+            ak.stock_zh_a_hist,
+            symbol=self._format_symbol(symbol),
+            period=period_str,
+            start_date=start_date,
+            end_date=end_date,
+            adjust=adjust_type
+        )
+        
+        if df.empty:
+            return pd.DataFrame()
+        
+        # 标准化数据格式
+        return self._normalize_hist_df(df, symbol)
+
+    async def _extend_cached_range(
+        self,
+        symbol: str,
+        period: Period,
+        start_date: str,
+        end_date: str,
+        adjust_type: str,
+        cached_start: str,
+        cached_end: str,
+        cached_df: pd.DataFrame
+    ) -> Optional[pd.DataFrame]:
+        """利用与请求区间重叠的缓存，只获取缺失的日期段(内部方法)
+        
+        只利用日K缓存: 周/月K按请求区间聚合，区间边界处的K线既无法拼接，
+        也不能从更大区间的缓存中切片得到。缓存完全覆盖请求区间时直接切片
+        返回；部分重叠时只对非前复权的数据增量补齐，前复权价格会随除权
+        整体变动，与新数据拼接会出现断层。缓存按复权类型区分，传入的
+        缓存数据与请求的复权类型一致。补齐后的完整区间写回缓存。
+        
+        缓存的结束日期只是当初请求的日期，当天及以后的K线在写入时可能尚未
+        收盘或还不存在，因此缓存只视为覆盖到昨天，之后的日期重新获取。
+        
+        Returns:
+            请求区间内的数据，无法利用缓存时返回None
+        """
+        if period is not Period.DAILY:
+            return None
+        
+        last_closed = self._shift_date(datetime.now().strftime('%Y%m%d'), -1)
+        if cached_end > last_closed:
+            cached_end = last_closed
+            if cached_end < cached_start:
+                return None
+            cached_df = self._slice_dates(cached_df, cached_start, cached_end)
+        
+        if cached_start <= start_date and end_date <= cached_end:
+            return self._slice_dates(cached_df, start_date, end_date)
+        
+        if adjust_type == 'qfq':
+            return None
+        
+        missing_ranges = []
+        if start_date < cached_start:
+            missing_ranges.append((start_date, self._shift_date(cached_start, -1)))
+        if end_date > cached_end:
+            missing_ranges.append((self._shift_date(cached_end, 1), end_date))
+        log.debug("缓存区间{}-{}，补齐缺失区间: {}", cached_start, cached_end, missing_ranges)
+        
+        fetched = await asyncio.gather(*(
+            self._fetch_hist_df(symbol, period, range_start, range_end, adjust_type)
+            for range_start, range_end in missing_ranges
+        ))
+        frames = [cached_df] + [f for f in fetched if not f.empty]
+        merged = self._fast_concat(frames).sort_values('date', kind='stable', ignore_index=True)
+        
+        self.cache.save_data(
+            symbol, _PERIOD_STR[period],
+            min(start_date, cached_start), max(end_date, cached_end), merged, adjust_type
+        )
+        return self._slice_dates(merged, start_date, end_date)
+
+    @staticmethod
+    def _slice_dates(df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+        """截取[start_date, end_date]区间内的数据(内部方法)"""
+        dates = df['date']
+        return df[(dates >= start_date) & (dates <= end_date)].reset_index(drop=True)
+
+    @staticmethod
+    def _shift_date(date: str, days: int) -> str:
+        """将YYYYMMDD日期平移指定天数(内部方法)"""
+        return (datetime.strptime(date, '%Y%m%d') + timedelta(days=days)).strftime('%Y%m%d')
+
+    @staticmethod
+    def _to_date_str(date: Union[str, datetime]) -> str:
+        """将日期统一为YYYYMMDD字符串(内部方法)"""
+        if hasattr(date, 'strftime'):
+            return date.strftime('%Y%m%d')
+        return date
+
+    def _mem_get(self, key: Tuple[str, ...]) -> Optional[pd.DataFrame]:
+        """从进程内LRU缓存读取数据(内部方法)
+        
+        写入超过 ``memory_cache_ttl`` 秒的数据视为过期并移除。
+        
+        Args:
+            key: (symbol, period, start_date, end_date, adjust_type)
+            
+        Returns:
+            DataFrame的浅拷贝，未命中或已过期时返回None
+        """
+        cached = self._mem_cache.get(key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] > self.config['memory_cache_ttl']:
+            del self._mem_cache[key]
+            return None
+        self._mem_cache.move_to_end(key)
+        return cached[1].copy(deep=False)
+    
+    def _mem_put(self, key: Tuple[str, ...], df: pd.DataFrame) -> None:
+        """写入进程内LRU缓存，超出容量时淘汰最久未使用的数据(内部方法)
+        
+        Args:
+            key: (symbol, period, start_date, end_date, adjust_type)
+            df: 历史数据
+        """
+        self._mem_cache[key] = (time.monotonic(), df)
+        self._mem_cache.move_to_end(key)
+        while len(self._mem_cache) > self._mem_cache_max:
+            self._mem_cache.popitem(last=False)
+
+    def _normalize_hist_df(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """将AKShare原始K线数据转换为标准格式(内部方法)
+        
+        直接从原始列取数组并一次性构造结果，避免rename/列选择/排序
+        各自生成中间DataFrame。
+        
+        Args:
+            df: ak.stock_zh_a_hist 返回的原始数据
+            symbol: 股票代码
+            
+        Returns:
+            按日期升序排列、日期格式为YYYYMMDD的DataFrame
+        """
+        dates = pd.to_datetime(df['日期'].to_numpy(), format='%Y-%m-%d', cache=True)
+        # AKShare通常已按日期升序返回，此时无需排序，切片只生成视图
+        if dates.is_monotonic_increasing:
+            order = slice(None)
+        else:
+            order = np.argsort(dates.to_numpy(), kind='stable')
+        
+        columns = {
+            'date': pd.array(dates.strftime('%Y%m%d').to_numpy()[order], dtype=_STRING_DTYPE)
+        }
+        for raw_col, out_col in zip(self._RAW_COLS[1:], self._OUT_COLS[1:]):
+            values = df[raw_col]
+            # 成交量转为int64，缺失值直接转换会变成int64最小值，先按0填充
+            if out_col == 'volume' and values.hasnans:
+                values = values.fillna(0)
+            columns[out_col] = values.to_numpy(dtype=self._OUT_DTYPES.get(out_col))[order]
+        columns['symbol'] = pd.array([symbol] * len(dates), dtype=_STRING_DTYPE)
+        
+        return pd.DataFrame(columns)
+
+    async def get_batch_historical_data(
+        self,
+        symbols: List[str],
+        period: Period,
+        start_date: Union[str, datetime],
+        end_date: Union[str, datetime],
         max_workers: int = 5
     ) -> pd.DataFrame:
         """批量获取多只股票的历史数据
@@ -194,55 +573,20 @@ class AKShareAdapter(MarketDataAdapter):
         Args:
             symbols: 股票代码列表
             period: 数据周期
-            start_date: 开始日期 (YYYYMMDD)
-            end_date: 结束日期 (YYYYMMDD)
+            start_date: 开始日期 (YYYYMMDD或datetime，整批只格式化一次)
+            end_date: 结束日期 (YYYYMMDD或datetime，整批只格式化一次)
             max_workers: 最大并发数
             
         Returns:
-            包含所有股票数据的DataFrame
+            包含所有股票数据的DataFrame，重复的股票代码只返回一份数据
         """
         try:
-            log.debug(f"开始批量获取{len(symbols)}只股票的{period.value}数据")
-            log.debug(f"股票列表: {symbols}")
-            
-            # 先从缓存获取数据
-            missed_symbols, cached_data = self.cache.get_batch_data(
-                symbols, period.value, start_date, end_date
+            data = await self.get_historical_data_batch(
+                symbols, period, start_date, end_date, max_workers=max_workers
             )
+            result = self._fast_concat(list(data.values()), list(data))
             
-            if not missed_symbols:
-                log.debug("所有数据均命中缓存")
-                return pd.concat(cached_data, ignore_index=True)
-                
-            # 获取未缓存的数据
-            log.debug(f"从API获取{len(missed_symbols)}只股票的数据")
-            semaphore = asyncio.Semaphore(max_workers)
-            tasks = []
-            
-            for symbol in missed_symbols:
-                task = self._get_single_stock_data(
-                    symbol=symbol,
-                    period=period,
-                    start_date=start_date,
-                    end_date=end_date,
-                    semaphore=semaphore
-                )
-                tasks.append(task)
-                
-            new_data = await asyncio.gather(*tasks)
-            
-            # 保存新数据到缓存
-            self.cache.save_batch_data(
-                missed_symbols, period.value,
-                start_date, end_date, new_data
-            )
-            
-            # 合并所有数据
-            all_data = cached_data + new_data
-            result = pd.concat(all_data, ignore_index=True)
-            
-            log.debug(f"成功获取{len(symbols)}/{len(symbols)}只股票的数据")
-            log.debug(f"数据行数: {len(result)}")
+            log.debug("成功获取{}只股票的数据，数据行数: {}", len(data), len(result))
             
             return result
             
@@ -250,36 +594,119 @@ class AKShareAdapter(MarketDataAdapter):
             log.error(f"批量获取数据出错: {str(e)}")
             raise
 
-    async def _get_single_stock_data(
+    @staticmethod
+    def _fast_concat(
+        frames: List[pd.DataFrame],
+        symbols: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """合并列结构相同的DataFrame(内部方法)
+        
+        每列只分配一次输出数组并依次拷贝各段数据，省去pd.concat的
+        索引重建与中间块对齐。Arrow等扩展类型按块拼接以保留dtype。
+        列结构不一致时退回pd.concat。
+        
+        给定symbols时，symbol列直接由各段长度生成分类编码，下游
+        groupby('symbol')无需再对字符串做哈希分组。
+        
+        Args:
+            frames: 待合并的DataFrame列表
+            symbols: 与frames一一对应的股票代码(不重复)
+            
+        Returns:
+            合并后的DataFrame(RangeIndex)
+        """
+        if not frames:
+            return pd.DataFrame()
+        
+        columns = list(frames[0].columns)
+        if any(list(f.columns) != columns for f in frames[1:]):
+            return pd.concat(frames, ignore_index=True)
+        
+        data = {}
+        for col in columns:
+            if symbols is not None and col == 'symbol':
+                codes = np.repeat(np.arange(len(symbols)), [len(f) for f in frames])
+                data[col] = pd.Categorical.from_codes(codes, categories=symbols)
+                continue
+            dtype = frames[0][col].dtype
+            if isinstance(dtype, np.dtype) or any(f[col].dtype != dtype for f in frames[1:]):
+                data[col] = np.concatenate([f[col].to_numpy() for f in frames])
+            else:
+                data[col] = pd.concat([f[col] for f in frames], ignore_index=True)
+        return pd.DataFrame(data)
+
+    async def get_historical_data_batch(
         self,
-        symbol: str,
+        symbols: List[str],
         period: Period,
-        start_date: str,
-        end_date: str,
-        semaphore: asyncio.Semaphore,
-        adjust_type: str = 'qfq'
-    ) -> pd.DataFrame:
-        """获取单只股票数据(内部方法)"""
-        async with semaphore:
-            return await self.get_historical_data(
-                symbol=symbol,
-                period=period,
-                start_date=start_date,
-                end_date=end_date,
-                adjust_type=adjust_type
+        start_date: Union[str, datetime],
+        end_date: Union[str, datetime],
+        adjust_type: str = 'qfq',
+        max_workers: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """批量获取多只股票的历史K线数据
+        
+        缓存只做一次批量查询；未命中的股票在线程池中并发请求，
+        获取结果在同一个事务中写回缓存。
+        
+        Args:
+            symbols: 股票代码列表
+            period: 数据周期
+            start_date: 开始日期 (YYYYMMDD或datetime)
+            end_date: 结束日期 (YYYYMMDD或datetime)
+            adjust_type: 复权类型
+            max_workers: 最大并发请求数，默认使用线程池大小
+            
+        Returns:
+            按输入顺序的 股票代码 -> DataFrame 字典，重复的股票代码只返回一份数据
+        """
+        # 去重并保持原有顺序，避免重复请求同一只股票
+        symbols = list(dict.fromkeys(symbols))
+        for symbol in symbols:
+            self._validate_symbol(symbol)
+        
+        start_date = self._to_date_str(start_date)
+        end_date = self._to_date_str(end_date)
+        period_str = _PERIOD_STR[period]
+        log.debug("开始批量获取{}只股票的{}数据: {}", len(symbols), period_str, symbols)
+        
+        missed_symbols, cached_data = self.cache.get_batch_data(
+            symbols, period_str, start_date, end_date, adjust_type
+        )
+        missed_set = set(missed_symbols)
+        data = dict(zip([s for s in symbols if s not in missed_set], cached_data))
+        
+        if missed_symbols:
+            log.debug("从API获取{}只股票的数据", len(missed_symbols))
+            semaphore = asyncio.Semaphore(max_workers or self.config['max_workers'])
+            
+            async def fetch(symbol: str) -> pd.DataFrame:
+                async with semaphore:
+                    df = await self._fetch_hist_df(symbol, period, start_date, end_date, adjust_type)
+                if df.empty:
+                    raise ValueError(f"获取数据为空: {symbol}")
+                return df
+            
+            fetched = await asyncio.gather(*(fetch(s) for s in missed_symbols))
+            self.cache.save_batch_data(
+                missed_symbols, period_str, start_date, end_date, fetched, adjust_type
             )
+            data.update(zip(missed_symbols, fetched))
+        
+        return {symbol: data[symbol] for symbol in symbols}
     
     # 为了保持向后兼容性，保留get_daily_data方法
     async def get_daily_data(
         self,
         symbol: str,
-        start_date: str,
-        end_date: str,
+        start_date: Union[str, datetime],
+        end_date: Union[str, datetime],
         adjust_type: str = 'qfq'
     ) -> pd.DataFrame:
         """Get daily historical data for an A-share stock.
         
-        This is a convenience method that calls get_historical_data with period=Period.DAILY
+        This is a convenience method that calls get_historical_data with period=Period.DAILY.
+        Dates may be YYYYMMDD strings or datetimes; they are formatted once there.
         """
         return await self.get_historical_data(
             symbol=symbol,
@@ -299,45 +726,67 @@ class AKShareAdapter(MarketDataAdapter):
             Dictionary mapping symbols to MarketData objects
         """
         try:
+            symbols = list(dict.fromkeys(symbols))
+            
+            # 校验代码的同时提取6位代码
+            codes = []
             for symbol in symbols:
                 self._validate_symbol(symbol)
+                codes.append(symbol[:6])
             
             # 获取实时行情
-            codes = [s.split('.')[0] for s in symbols]
-            df = ak.stock_zh_a_spot_em()  # 东方财富网接口
-            
-            # 过滤所需股票
-            df = df[df['代码'].isin(codes)]
-            
-            result = {}
-            for symbol in symbols:
-                code = symbol.split('.')[0]
-                stock_data = df[df['代码'] == code].iloc[0]
-                
-                result[symbol] = MarketData(
+            df = await self._run_blocking(ak.stock_zh_a_spot_em)  # 东方财富网接口
+            
+            # 按代码建立一次哈希索引，再按请求顺序取出所需列
+            spot = df.set_index('代码')
+            for symbol, code in zip(symbols, codes):
+                if code not in spot.index:
+                    raise ValueError(f"未找到实时行情: {symbol}")
+            
+            quotes = spot.loc[codes, list(self._SPOT_COLUMN_MAP)]
+            quotes.columns = list(self._SPOT_COLUMN_MAP.values())
+            # 停牌股票成交量为空，按0处理
+            quotes['volume'] = quotes['volume'].fillna(0).astype('int64')
+            
+            now = datetime.now()
+            return {
+                symbol: MarketData(
                     symbol=symbol,
-                    timestamp=datetime.now(),
-                    open=float(stock_data['开盘']),
-                    high=float(stock_data['最高']),
-                    low=float(stock_data['最低']),
-                    close=float(stock_data['最新价']),
-                    volume=float(stock_data['成交量']),
-                    amount=float(stock_data['成交额'])
+                    market=self.market,
+                    timestamp=now,
+                    open=row.open,
+                    high=row.high,
+                    low=row.low,
+                    close=row.close,
+                    volume=row.volume,
+                    amount=row.amount
                 )
-            
-            return result
+                for symbol, row in zip(symbols, quotes.itertuples(index=False))
+            }
             
         except Exception as e:
             self._handle_error(e, "Failed to get real-time quotes")
             
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """在线程池中执行同步的AKShare接口，避免阻塞事件循环
+        
+        Args:
+            func: 同步函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+            
+        Returns:
+            函数返回值
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            
     def _get_exchange_suffix(self, code: str) -> str:
         """Get exchange suffix for a stock code."""
-        if code.startswith(('600', '601', '603', '605', '688')):
-            return 'SH'  # 上海证券交易所
-        elif code.startswith(('000', '001', '002', '003', '300', '301')):
-            return 'SZ'  # 深圳证券交易所
-        else:
-            raise ValueError(f"Unknown exchange for stock code: {code}")
+        try:
+            return _PREFIX_TO_EXCHANGE[code[:3]]
+        except KeyError:
+            raise ValueError(f"Unknown exchange for stock code: {code}") from None
             
     def _format_symbol(self, symbol: str) -> str:
         """格式化股票代码（移除市场后缀）
@@ -348,7 +797,8 @@ class AKShareAdapter(MarketDataAdapter):
         Returns:
             不带后缀的股票代码 (e.g., '000001')
         """
-        return symbol.split('.')[0]
+        # 代码格式已由_validate_symbol保证为 DDDDDD.XX
+        return symbol[:6]
         
     def _validate_symbol(self, symbol: str) -> None:
         """验证股票代码格式
@@ -359,8 +809,8 @@ class AKShareAdapter(MarketDataAdapter):
         Raises:
             ValueError: 股票代码格式无效
         """
-        if not isinstance(symbol, str):
+        if type(symbol) is not str:
             raise ValueError(f"股票代码必须是字符串类型: {symbol}")
-            
-        if not re.match(r'^\d{6}\.(SH|SZ)$', symbol):
+        
+        if not _is_cn_symbol(symbol):
             raise ValueError(f"股票代码格式无效: {symbol}")
@@ -1,9 +1,12 @@
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
-import json
+from typing import Optional, List, Tuple, Iterator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +20,9 @@ class CacheManager:
     3. 批量数据存取
     """
     
+    # 批量查询时每条SQL的股票数(SQLite旧版本单条语句最多999个参数)
+    BATCH_QUERY_SIZE = 500
+    
     def __init__(self, cache_dir: str = "cache"):
         """初始化缓存管理器
         
@@ -26,23 +32,74 @@ class CacheManager:
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
         self.db_path = os.path.join(cache_dir, "stock_data.db")
+        # 整个生命周期复用同一个连接，避免每次调用都重新打开文件、加载表结构；
+        # 连接可能在线程池中使用，由锁保证串行访问
+        self._lock = threading.RLock()
+        self._conn = self._connect()
         self._init_db()
         
+    def _connect(self) -> sqlite3.Connection:
+        """创建并配置数据库连接
+        
+        使用自动提交模式(isolation_level=None)，写操作通过_transaction显式开启事务。
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # WAL模式下读写互不阻塞；NORMAL同步级别在WAL下仍可保证数据库不损坏
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 页缓存上限64MB(负数表示KB)
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """在单个事务中执行写操作，出错时回滚"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+        
     def _init_db(self):
-        """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
+        """初始化数据库表结构
+        
+        旧版本以JSON文本(data TEXT)存储数据或缓存键不含复权类型(adjust)，
+        检测到时直接重建表。
+        """
+        with self._transaction() as conn:
+            columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(stock_data)")}
+            if columns and (columns.get('data') == 'TEXT' or 'adjust' not in columns):
+                logger.info("缓存格式已变更，清空旧缓存")
+                conn.execute("DROP TABLE stock_data")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS stock_data (
                     symbol TEXT,
                     period TEXT,
                     start_date TEXT,
                     end_date TEXT,
-                    data TEXT,
+                    adjust TEXT,
+                    data BLOB,
                     created_at TIMESTAMP,
                     expire_at TIMESTAMP,
-                    PRIMARY KEY (symbol, period, start_date, end_date)
+                    PRIMARY KEY (symbol, period, adjust, start_date, end_date)
                 )
             """)
+            # 覆盖索引包含expire_at，查询条件可完全在索引内判断，命中后才读取data
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_lookup
+                ON stock_data(symbol, period, adjust, start_date, end_date, expire_at)
+            """)
+            # 清理过期数据时按索引范围删除，无需全表扫描
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_expire ON stock_data(expire_at)")
             
     def _get_expire_time(self, period: str) -> datetime:
         """获取数据过期时间
@@ -59,9 +116,26 @@ class CacheManager:
             "monthly": 30
         }
         return now + timedelta(days=expire_days.get(period, 7))
+    
+    @staticmethod
+    def _serialize(data: pd.DataFrame) -> bytes:
+        """将DataFrame序列化为缓存内容
+        
+        使用Arrow IPC(Feather)二进制格式，列式数据近乎直接拷贝，
+        且保留float32、Arrow字符串等列类型。
+        """
+        sink = pa.BufferOutputStream()
+        feather.write_feather(data, sink)
+        return sink.getvalue().to_pybytes()
+    
+    @staticmethod
+    def _deserialize(payload: bytes) -> pd.DataFrame:
+        """将缓存内容反序列化为DataFrame"""
+        return feather.read_table(pa.BufferReader(payload)).to_pandas()
         
     def get_data(self, symbol: str, period: str, 
-                 start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+                 start_date: str, end_date: str,
+                 adjust: str = 'qfq') -> Optional[pd.DataFrame]:
         """获取缓存的股票数据
         
         Args:
@@ -69,25 +143,26 @@ class CacheManager:
             period: 数据周期(daily/weekly/monthly)
             start_date: 开始日期
             end_date: 结束日期
+            adjust: 复权类型(qfq/hfq/空字符串表示不复权)
             
         Returns:
             DataFrame或None(未命中缓存)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
+            with self._lock:
+                cursor = self._conn.execute("""
                     SELECT data FROM stock_data 
-                    WHERE symbol = ? AND period = ? 
+                    WHERE symbol = ? AND period = ? AND adjust = ?
                     AND start_date = ? AND end_date = ?
                     AND expire_at > datetime('now')
-                """, (symbol, period, start_date, end_date))
+                """, (symbol, period, adjust, start_date, end_date))
                 row = cursor.fetchone()
                 
                 if row:
-                    logger.debug(f"缓存命中: {symbol} {period} {start_date}-{end_date}")
-                    return pd.read_json(row[0])
+                    logger.debug("缓存命中: %s %s %s-%s", symbol, period, start_date, end_date)
+                    return self._deserialize(row[0])
                     
-                logger.debug(f"缓存未命中: {symbol} {period} {start_date}-{end_date}")
+                logger.debug("缓存未命中: %s %s %s-%s", symbol, period, start_date, end_date)
                 return None
                 
         except Exception as e:
@@ -96,7 +171,7 @@ class CacheManager:
             
     def save_data(self, symbol: str, period: str,
                   start_date: str, end_date: str,
-                  data: pd.DataFrame) -> bool:
+                  data: pd.DataFrame, adjust: str = 'qfq') -> bool:
         """保存股票数据到缓存
         
         Args:
@@ -105,30 +180,83 @@ class CacheManager:
             start_date: 开始日期
             end_date: 结束日期
             data: 股票数据DataFrame
+            adjust: 复权类型
             
         Returns:
             是否保存成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                expire_at = self._get_expire_time(period)
+            expire_at = self._get_expire_time(period)
+            payload = self._serialize(data)
+            with self._transaction() as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO stock_data
-                    (symbol, period, start_date, end_date, data, created_at, expire_at)
-                    VALUES (?, ?, ?, ?, ?, datetime('now'), ?)
+                    (symbol, period, adjust, start_date, end_date, data, created_at, expire_at)
+                    VALUES (?, ?, ?, ?, ?, ?, datetime('now'), ?)
                 """, (
-                    symbol, period, start_date, end_date,
-                    data.to_json(), expire_at
+                    symbol, period, adjust, start_date, end_date,
+                    payload, expire_at
                 ))
-                logger.debug(f"保存缓存成功: {symbol} {period} {start_date}-{end_date}")
-                return True
+            logger.debug("保存缓存成功: %s %s %s-%s", symbol, period, start_date, end_date)
+            return True
                 
         except Exception as e:
             logger.error(f"保存缓存出错: {str(e)}")
             return False
             
+    def get_overlapping_data(self, symbol: str, period: str,
+                             start_date: str, end_date: str,
+                             adjust: str = 'qfq'
+                             ) -> Optional[Tuple[str, str, pd.DataFrame]]:
+        """获取与日期区间重叠最多的缓存数据
+        
+        用于请求区间与已缓存区间部分重叠时，只补齐缺失的日期段。
+        
+        Args:
+            symbol: 股票代码
+            period: 数据周期
+            start_date: 开始日期 (YYYYMMDD)
+            end_date: 结束日期 (YYYYMMDD)
+            adjust: 复权类型，只匹配相同复权类型的缓存
+            
+        Returns:
+            (缓存开始日期, 缓存结束日期, DataFrame)，没有重叠的缓存时返回None
+        """
+        try:
+            with self._lock:
+                conn = self._conn
+                rows = conn.execute("""
+                    SELECT start_date, end_date FROM stock_data
+                    WHERE symbol = ? AND period = ? AND adjust = ?
+                    AND start_date <= ? AND end_date >= ?
+                    AND expire_at > datetime('now')
+                """, (symbol, period, adjust, end_date, start_date)).fetchall()
+                
+                if not rows:
+                    return None
+                
+                def overlap_days(row: Tuple[str, str]) -> int:
+                    lo = datetime.strptime(max(row[0], start_date), '%Y%m%d')
+                    hi = datetime.strptime(min(row[1], end_date), '%Y%m%d')
+                    return (hi - lo).days
+                
+                cached_start, cached_end = max(rows, key=overlap_days)
+                row = conn.execute("""
+                    SELECT data FROM stock_data
+                    WHERE symbol = ? AND period = ? AND adjust = ?
+                    AND start_date = ? AND end_date = ?
+                """, (symbol, period, adjust, cached_start, cached_end)).fetchone()
+                
+                logger.debug("区间缓存命中: %s %s %s-%s", symbol, period, cached_start, cached_end)
+                return cached_start, cached_end, self._deserialize(row[0])
+                
+        except Exception as e:
+            logger.error(f"读取区间缓存出错: {str(e)}")
+            return None
+            
     def get_batch_data(self, symbols: List[str], period: str,
-                      start_date: str, end_date: str) -> Tuple[List[str], List[pd.DataFrame]]:
+                      start_date: str, end_date: str,
+                      adjust: str = 'qfq') -> Tuple[List[str], List[pd.DataFrame]]:
         """批量获取缓存数据
         
         Args:
@@ -136,25 +264,48 @@ class CacheManager:
             period: 数据周期
             start_date: 开始日期
             end_date: 结束日期
+            adjust: 复权类型
             
         Returns:
             (未命中缓存的股票列表, 命中缓存的数据列表)
         """
-        cached_data = []
-        missed_symbols = []
-        
-        for symbol in symbols:
-            data = self.get_data(symbol, period, start_date, end_date)
-            if data is not None:
-                cached_data.append(data)
-            else:
-                missed_symbols.append(symbol)
-                
-        return missed_symbols, cached_data
+        try:
+            payloads = {}
+            with self._lock:
+                conn = self._conn
+                # 单条语句的参数个数有上限，按块查询
+                for i in range(0, len(symbols), self.BATCH_QUERY_SIZE):
+                    chunk = symbols[i:i + self.BATCH_QUERY_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = conn.execute(f"""
+                        SELECT symbol, data FROM stock_data
+                        WHERE symbol IN ({placeholders}) AND period = ? AND adjust = ?
+                        AND start_date = ? AND end_date = ?
+                        AND expire_at > datetime('now')
+                    """, (*chunk, period, adjust, start_date, end_date))
+                    payloads.update(cursor.fetchall())
+            
+            cached_data = []
+            missed_symbols = []
+            for symbol in symbols:
+                payload = payloads.get(symbol)
+                if payload is not None:
+                    cached_data.append(self._deserialize(payload))
+                else:
+                    missed_symbols.append(symbol)
+            
+            logger.debug("批量缓存命中: %d/%d %s %s-%s",
+                         len(cached_data), len(symbols), period, start_date, end_date)
+            return missed_symbols, cached_data
+            
+        except Exception as e:
+            logger.error(f"批量读取缓存出错: {str(e)}")
+            return list(symbols), []
         
     def save_batch_data(self, symbols: List[str], period: str,
                        start_date: str, end_date: str,
-                       data_list: List[pd.DataFrame]) -> None:
+                       data_list: List[pd.DataFrame],
+                       adjust: str = 'qfq') -> None:
         """批量保存数据到缓存
         
         Args:
@@ -163,9 +314,25 @@ class CacheManager:
             start_date: 开始日期
             end_date: 结束日期
             data_list: 数据DataFrame列表
+            adjust: 复权类型
         """
-        for symbol, data in zip(symbols, data_list):
-            self.save_data(symbol, period, start_date, end_date, data)
+        try:
+            expire_at = self._get_expire_time(period)
+            rows = [
+                (symbol, period, adjust, start_date, end_date, self._serialize(data), expire_at)
+                for symbol, data in zip(symbols, data_list)
+            ]
+            # 所有记录在同一个事务中写入，只提交(刷盘)一次
+            with self._transaction() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO stock_data
+                    (symbol, period, adjust, start_date, end_date, data, created_at, expire_at)
+                    VALUES (?, ?, ?, ?, ?, ?, datetime('now'), ?)
+                """, rows)
+            logger.debug("批量保存缓存成功: %d条 %s %s-%s", len(rows), period, start_date, end_date)
+            
+        except Exception as e:
+            logger.error(f"批量保存缓存出错: {str(e)}")
             
     def clear_expired(self) -> int:
         """清理过期缓存数据
@@ -174,7 +341,7 @@ class CacheManager:
             清理的记录数
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.execute("""
                     DELETE FROM stock_data 
                     WHERE expire_at <= datetime('now')
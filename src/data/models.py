@@ -1,12 +1,17 @@
 """
 Base data models for the quantitative trading system.
 """
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 import pandas as pd
 
-@dataclass
+# slots drop the per-instance __dict__ (less memory, faster attribute access);
+# the option is only available on Python 3.10+.
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class MarketData:
     """Base class for market data."""
     symbol: str
@@ -38,7 +43,7 @@ class MarketData:
             'amount': self.amount
         }
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class StockInfo:
     """Stock basic information."""
     symbol: str
@@ -79,15 +84,18 @@ class DataValidator:
             if not pd.api.types.is_numeric_dtype(data[col]):
                 return False
         
-        # Check for missing values
-        if data[required_columns].isnull().any().any():
-            return False
+        # Check for missing values (column by column, stopping at the first hit)
+        for col in required_columns:
+            if data[col].isna().any():
+                return False
         
-        # Check value ranges
-        if (data[['open', 'high', 'low', 'close']] < 0).any().any():
-            return False
+        if data.empty:
+            return True
         
-        if (data[['volume', 'amount']] < 0).any().any():
-            return False
+        # Check value ranges; a single min() reduction per column avoids
+        # building a boolean mask
+        for col in numeric_columns:
+            if data[col].to_numpy().min() < 0:
+                return False
         
         return True
@@ -2,35 +2,108 @@
 Logging utility module for the quantitative trading system.
 """
 from loguru import logger
+import gzip
+import os
+import shutil
 import sys
 from ..config.settings import LOGGING_CONFIG, BASE_DIR
 
-def setup_logger():
-    """Configure the logger with predefined settings."""
+def _gzip_compress(path: str) -> None:
+    """Compress a rotated log file with gzip level 1 and remove the original.
+    
+    Level 1 is several times faster than zip's default level for text logs
+    while still shrinking them substantially.
+    """
+    with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb', compresslevel=1) as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+
+# Set once the log directory has been created; it does not go away while the
+# process runs, so later reconfigurations skip the check
+_LOGDIR_READY = False
+
+# Set once the sinks are registered, so repeated setup calls do not tear down
+# and reopen the handlers
+_CONFIGURED = False
+
+def setup_logger(force: bool = False):
+    """Configure the logger with predefined settings.
+    
+    Only the first call registers the sinks; later calls return the already
+    configured logger unless ``force`` is set.
+    
+    Args:
+        force: Remove and re-add the sinks even if already configured
+    """
+    global _LOGDIR_READY, _CONFIGURED
+    if _CONFIGURED and not force:
+        return logger
+    
+    fmt = LOGGING_CONFIG["format"]
+    level = LOGGING_CONFIG["level"]
+    rotation = LOGGING_CONFIG["rotation"]
+    
     # Remove default handler
     logger.remove()
     
-    # Add custom handler for console output
+    # Add custom handler for console output; colour only when attached to a
+    # terminal, so piped/CI output skips ANSI markup
     logger.add(
         sys.stderr,
-        format=LOGGING_CONFIG["format"],
-        level=LOGGING_CONFIG["level"],
-        colorize=True
+        format=fmt,
+        level=level,
+        colorize=sys.stderr.isatty()
     )
     
     # Add file handler for persistent logs
-    log_file = BASE_DIR / "logs" / "app.log"
-    log_file.parent.mkdir(exist_ok=True)
+    log_dir = os.path.join(BASE_DIR, "logs")
+    if not _LOGDIR_READY:
+        os.makedirs(log_dir, exist_ok=True)
+        _LOGDIR_READY = True
+    log_file = os.path.join(log_dir, "app.log")
+    
+    # enqueue=True hands records to a background thread, so callers never
+    # block on disk writes or on rotation/compression; a 64KB buffer batches
+    # records into few write() calls (flushed on rotation and at exit)
+    logger.add(
+        log_file,
+        rotation=rotation,
+        level=level,
+        format=fmt,
+        compression=_gzip_compress,
+        buffering=65536,
+        enqueue=True,
+        backtrace=False,
+        diagnose=False
+    )
     
+    # Warnings and errors also go to an unbuffered, synchronous sink so they
+    # reach disk immediately even if the process dies before the buffer above
+    # is flushed
     logger.add(
-        str(log_file),
-        rotation=LOGGING_CONFIG["rotation"],
-        level=LOGGING_CONFIG["level"],
-        format=LOGGING_CONFIG["format"],
-        compression="zip"
+        os.path.join(log_dir, "error.log"),
+        rotation=rotation,
+        level="WARNING",
+        format=fmt,
+        compression=_gzip_compress,
+        backtrace=False,
+        diagnose=False
     )
     
+    _CONFIGURED = True
     return logger
 
+class _LazyLogger:
+    """Proxy that configures the logger on first use.
+    
+    Importing this module no longer creates the log directory or registers
+    sinks; that happens on the first attribute access (e.g. ``log.info``).
+    """
+    
+    def __getattr__(self, name):
+        if not _CONFIGURED:
+            setup_logger()
+        return getattr(logger, name)
+
 # Create logger instance
-log = setup_logger()
+log = _LazyLogger()
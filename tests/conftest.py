@@ -0,0 +1,11 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+from datetime import datetime
+
+
+@pytest.fixture(scope="session")
+def now():
+    """A single reference time shared by every test in the session."""
+    return datetime.now()
@@ -1,21 +1,49 @@
 """
 Tests for AKShare adapter.
 """
+import asyncio
 import pytest
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
-from src.data.adapters.akshare_adapter import AKShareAdapter
+from src.data.adapters.akshare_adapter import AKShareAdapter, Period
+from src.data.cache.cache_manager import CacheManager
 from src.data.models import StockInfo, MarketData
 
 
+EXPECTED_SYMBOLS = frozenset({'000001.SZ', '600000.SH'})
+
+
+@pytest.fixture(scope="module")
+def shared_adapter():
+    """Create one AKShare adapter for the whole module."""
+    adapter = AKShareAdapter()
+    yield adapter
+    adapter.close()
+
+
 @pytest.fixture
-def adapter():
-    """Create an AKShare adapter instance."""
-    return AKShareAdapter()
+def adapter(shared_adapter, monkeypatch):
+    """Provide the shared adapter with its in-memory caches reset."""
+    monkeypatch.setattr(shared_adapter, '_stock_list_cache', None)
+    monkeypatch.setattr(shared_adapter, '_stock_list_lock', asyncio.Lock())
+    monkeypatch.setattr(shared_adapter, '_stock_info_cache', {})
+    monkeypatch.setattr(shared_adapter, '_mem_cache', OrderedDict())
+    return shared_adapter
 
 
 @pytest.fixture
+def tmp_cache(adapter, tmp_path, monkeypatch):
+    """Point the adapter at an empty on-disk cache for one test."""
+    cache = CacheManager(cache_dir=str(tmp_path))
+    monkeypatch.setattr(adapter, 'cache', cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(scope="session")
 def mock_stock_list():
     """Mock stock list data."""
     return pd.DataFrame({
@@ -24,7 +52,7 @@ def mock_stock_list():
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_stock_info():
     """Mock stock info data."""
     return pd.DataFrame({
@@ -33,7 +61,7 @@ def mock_stock_info():
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_daily_data():
     """Mock daily historical data."""
     return pd.DataFrame({
@@ -47,22 +75,25 @@ def mock_daily_data():
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_real_time_data():
-    """Mock real-time market data."""
+    """Mock real-time market data.
+
+    Numeric columns are contiguous NumPy arrays and string columns are
+    Arrow-backed, so the frame wraps them without per-value Python objects.
+    """
     return pd.DataFrame({
-        '代码': ['000001', '600000'],
-        '名称': ['平安银行', '浦发银行'],
-        '最新价': [10.2, 15.3],
-        '开盘': [10.0, 15.0],
-        '最高': [10.4, 15.5],
-        '最低': [9.8, 14.8],
-        '成交量': [1000000, 2000000],
-        '成交额': [10200000, 30600000]
-    })
+        '代码': pd.array(['000001', '600000'], dtype='string[pyarrow]'),
+        '名称': pd.array(['平安银行', '浦发银行'], dtype='string[pyarrow]'),
+        '最新价': np.array([10.2, 15.3], dtype=np.float64),
+        '开盘': np.array([10.0, 15.0], dtype=np.float64),
+        '最高': np.array([10.4, 15.5], dtype=np.float64),
+        '最低': np.array([9.8, 14.8], dtype=np.float64),
+        '成交量': np.array([1000000, 2000000], dtype=np.int64),
+        '成交额': np.array([10200000, 30600000], dtype=np.float64)
+    }, copy=False)
 
 
-@pytest.mark.asyncio
 @patch('akshare.stock_info_a_code_name')
 async def test_get_stock_list(mock_ak_stock_list, adapter, mock_stock_list):
     """Test getting stock list."""
@@ -71,15 +102,38 @@ async def test_get_stock_list(mock_ak_stock_list, adapter, mock_stock_list):
     stocks = await adapter.get_stock_list()
     
     assert len(stocks) == 2
-    assert all(isinstance(stock, StockInfo) for stock in stocks)
-    assert all(stock.market == 'CN' for stock in stocks)
+    assert all(type(stock) is StockInfo for stock in stocks)
+    markets = np.fromiter((stock.market for stock in stocks), dtype=object, count=len(stocks))
+    assert (markets == 'CN').all()
     
     # Test symbol format
     assert stocks[0].symbol == '000001.SZ'
     assert stocks[1].symbol == '600000.SH'
 
 
-@pytest.mark.asyncio
+@patch('akshare.stock_info_a_code_name')
+async def test_get_stock_list_cached(mock_ak_stock_list, adapter, mock_stock_list):
+    """Test that the stock list is fetched once and served from memory."""
+    mock_ak_stock_list.return_value = mock_stock_list
+
+    first = await adapter.get_stock_list()
+    second = await adapter.get_stock_list()
+
+    assert first == second
+    assert mock_ak_stock_list.call_count == 1
+
+
+@patch('akshare.stock_info_a_code_name')
+async def test_get_stock_list_concurrent(mock_ak_stock_list, adapter, mock_stock_list):
+    """Test that concurrent callers share a single fetch."""
+    mock_ak_stock_list.return_value = mock_stock_list
+
+    results = await asyncio.gather(*(adapter.get_stock_list() for _ in range(5)))
+
+    assert all(stocks is results[0] for stocks in results)
+    assert mock_ak_stock_list.call_count == 1
+
+
 @patch('akshare.stock_individual_info_em')
 async def test_get_stock_info(mock_ak_stock_info, adapter, mock_stock_info):
     """Test getting stock information."""
@@ -96,14 +150,24 @@ async def test_get_stock_info(mock_ak_stock_info, adapter, mock_stock_info):
     assert stock_info.list_date == datetime(1991, 4, 3)
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize('value, expected', [
+    (19910403, datetime(1991, 4, 3)),
+    ('1991-04-03', datetime(1991, 4, 3)),
+    ('-', None),
+    (None, None),
+])
+def test_parse_list_date(value, expected):
+    """Test listing date parsing for the formats AKShare returns."""
+    assert AKShareAdapter._parse_list_date(value) == expected
+
+
 @patch('akshare.stock_zh_a_hist')
-async def test_get_daily_data(mock_ak_daily_data, adapter, mock_daily_data):
+async def test_get_daily_data(mock_ak_daily_data, adapter, mock_daily_data, now):
     """Test getting daily historical data."""
     mock_ak_daily_data.return_value = mock_daily_data
     
     symbol = '000001.SZ'
-    end_date = datetime.now()
+    end_date = now
     start_date = end_date - timedelta(days=30)
     
     df = await adapter.get_daily_data(symbol, start_date, end_date)
@@ -111,24 +175,75 @@ async def test_get_daily_data(mock_ak_daily_data, adapter, mock_daily_data):
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
     assert all(col in df.columns for col in ['open', 'high', 'low', 'close', 'volume', 'amount'])
-    assert df.index.name == 'date'
+    assert isinstance(df.index, pd.RangeIndex)
+    assert 'date' in df.columns
     assert 'symbol' in df.columns
     assert all(df['symbol'] == symbol)
 
 
-@pytest.mark.asyncio
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_memory_cache(mock_ak_daily_data, adapter, mock_daily_data):
+    """Test that repeated identical queries are served from the in-memory cache."""
+    mock_ak_daily_data.return_value = mock_daily_data
+
+    with patch.object(adapter.cache, 'get_data', return_value=None) as mock_get, \
+            patch.object(adapter.cache, 'save_data', return_value=True):
+        first = await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240201', '20240229')
+        second = await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240201', '20240229')
+
+    pd.testing.assert_frame_equal(first, second)
+    assert mock_ak_daily_data.call_count == 1
+    assert mock_get.call_count == 1
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_memory_cache_expires(mock_ak_daily_data, adapter, mock_daily_data):
+    """Test that in-memory entries older than memory_cache_ttl are not served."""
+    mock_ak_daily_data.return_value = mock_daily_data
+    ttl = adapter.config['memory_cache_ttl']
+
+    with patch.object(adapter.cache, 'get_data', return_value=None), \
+            patch.object(adapter.cache, 'save_data', return_value=True), \
+            patch('src.data.adapters.akshare_adapter.time.monotonic', return_value=1000.0) as clock:
+        await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240201', '20240229')
+        clock.return_value = 1000.0 + ttl
+        await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240201', '20240229')
+        assert mock_ak_daily_data.call_count == 1
+
+        clock.return_value = 1000.0 + ttl + 1
+        await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240201', '20240229')
+
+    assert mock_ak_daily_data.call_count == 2
+
+
+def test_normalize_hist_df_fills_missing_volume(adapter):
+    """Test that a missing volume becomes 0 instead of wrapping to the int64 minimum."""
+    raw = pd.DataFrame({
+        '日期': ['2024-02-26', '2024-02-27'],
+        '开盘': [10.0, 10.1],
+        '收盘': [10.1, 10.2],
+        '最高': [10.2, 10.3],
+        '最低': [9.9, 10.0],
+        '成交量': [100.0, np.nan],
+        '成交额': [1000.0, 2000.0]
+    })
+
+    df = adapter._normalize_hist_df(raw, '000001.SZ')
+
+    assert df['volume'].dtype == 'int64'
+    assert df['volume'].tolist() == [100, 0]
+
+
 @patch('akshare.stock_zh_a_spot_em')
 async def test_get_real_time_quotes(mock_ak_real_time, adapter, mock_real_time_data):
     """Test getting real-time quotes."""
     mock_ak_real_time.return_value = mock_real_time_data
     
-    symbols = ['000001.SZ', '600000.SH']
-    quotes = await adapter.get_real_time_quotes(symbols)
+    quotes = await adapter.get_real_time_quotes(sorted(EXPECTED_SYMBOLS))
     
     assert isinstance(quotes, dict)
-    assert len(quotes) == len(symbols)
-    assert all(symbol in quotes for symbol in symbols)
-    assert all(isinstance(quote, MarketData) for quote in quotes.values())
+    assert quotes.keys() == EXPECTED_SYMBOLS
+    assert all(type(quote) is MarketData for quote in quotes.values())
     
     # Test quote data for first symbol
     quote = quotes['000001.SZ']
@@ -140,22 +255,181 @@ async def test_get_real_time_quotes(mock_ak_real_time, adapter, mock_real_time_d
     assert quote.volume == 1000000
 
 
-def test_invalid_symbol(adapter):
+@pytest.mark.parametrize('symbol', ['INVALID', '000001.XX'])
+def test_invalid_symbol(adapter, symbol):
     """Test handling of invalid symbols."""
     with pytest.raises(ValueError):
-        adapter._validate_symbol('INVALID')
-    
-    with pytest.raises(ValueError):
-        adapter._validate_symbol('000001.XX')
+        adapter._validate_symbol(symbol)
 
 
-def test_invalid_date_range(adapter):
+@pytest.mark.parametrize('start_offset, end_offset', [
+    (timedelta(days=1), timedelta(days=1)),    # end date in the future
+    (timedelta(days=-1), timedelta(days=-2)),  # start after end
+])
+def test_invalid_date_range(adapter, now, start_offset, end_offset):
     """Test handling of invalid date ranges."""
-    future_date = datetime.now() + timedelta(days=1)
-    past_date = datetime.now() - timedelta(days=1)
-    
-    with pytest.raises(ValueError):
-        adapter._validate_date_range(future_date, future_date)
-    
     with pytest.raises(ValueError):
-        adapter._validate_date_range(past_date, past_date - timedelta(days=1))
+        adapter._validate_date_range(now + start_offset, now + end_offset)
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_extends_cached_range(mock_ak_hist, adapter, tmp_cache):
+    """Test that a widened window only fetches the dates missing from the cache."""
+    raw = pd.DataFrame({
+        '日期': ['2024-02-26', '2024-02-27', '2024-02-28', '2024-02-29', '2024-03-01'],
+        '开盘': [10.0, 10.1, 10.2, 10.3, 10.4],
+        '收盘': [10.1, 10.2, 10.3, 10.4, 10.5],
+        '最高': [10.2, 10.3, 10.4, 10.5, 10.6],
+        '最低': [9.9, 10.0, 10.1, 10.2, 10.3],
+        '成交量': [100, 200, 300, 400, 500],
+        '成交额': [1000.0, 2000.0, 3000.0, 4000.0, 5000.0]
+    })
+
+    def fake_hist(symbol, period, start_date, end_date, adjust):
+        dates = raw['日期'].str.replace('-', '')
+        return raw[(dates >= start_date) & (dates <= end_date)]
+
+    mock_ak_hist.side_effect = fake_hist
+
+    await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240226', '20240228', adjust_type='hfq')
+    df = await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240226', '20240301', adjust_type='hfq')
+
+    assert df['date'].tolist() == ['20240226', '20240227', '20240228', '20240229', '20240301']
+    assert mock_ak_hist.call_count == 2
+    assert mock_ak_hist.call_args.kwargs['start_date'] == '20240229'
+    assert mock_ak_hist.call_args.kwargs['end_date'] == '20240301'
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_refetches_unclosed_bars(mock_ak_hist, adapter, now, tmp_cache):
+    """Test that bars from today onward are refetched even if the cached window ends later."""
+    days = [(now + timedelta(days=offset)).strftime('%Y%m%d') for offset in range(-3, 3)]
+
+    def make_raw(dates, close):
+        return pd.DataFrame({
+            '日期': [f'{d[:4]}-{d[4:6]}-{d[6:]}' for d in dates],
+            '开盘': [10.0] * len(dates),
+            '收盘': [close] * len(dates),
+            '最高': [11.0] * len(dates),
+            '最低': [9.0] * len(dates),
+            '成交量': [100] * len(dates),
+            '成交额': [1000.0] * len(dates)
+        })
+
+    # Cached intraday: the window runs to tomorrow but today's bar is still partial
+    tmp_cache.save_data(
+        '000001.SZ', 'daily', days[0], days[4],
+        adapter._normalize_hist_df(make_raw(days[:4], 10.0), '000001.SZ'), 'hfq'
+    )
+    mock_ak_hist.return_value = make_raw(days[3:4], 10.5)
+
+    df = await adapter.get_historical_data('000001.SZ', Period.DAILY, days[0], days[5], adjust_type='hfq')
+
+    assert mock_ak_hist.call_count == 1
+    assert mock_ak_hist.call_args.kwargs['start_date'] == days[3]
+    assert mock_ak_hist.call_args.kwargs['end_date'] == days[5]
+    assert df['date'].tolist() == days[:4]
+    assert df['close'].iloc[-1] == pytest.approx(10.5)
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_does_not_slice_weekly_cache(mock_ak_hist, adapter, mock_daily_data, tmp_cache):
+    """Test that a narrower weekly window is fetched rather than sliced from a cached superset."""
+    mock_ak_hist.return_value = mock_daily_data
+
+    await adapter.get_historical_data('000001.SZ', Period.WEEKLY, '20240101', '20240229')
+    await adapter.get_historical_data('000001.SZ', Period.WEEKLY, '20240103', '20240228')
+
+    assert mock_ak_hist.call_count == 2
+    assert mock_ak_hist.call_args.kwargs['start_date'] == '20240103'
+    assert mock_ak_hist.call_args.kwargs['end_date'] == '20240228'
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_does_not_mix_adjust_types(mock_ak_hist, adapter, mock_daily_data, tmp_cache):
+    """Test that cached qfq data is never reused or stitched for an hfq request."""
+    mock_ak_hist.return_value = mock_daily_data
+
+    await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240226', '20240228', adjust_type='qfq')
+    await adapter.get_historical_data('000001.SZ', Period.DAILY, '20240226', '20240301', adjust_type='hfq')
+
+    assert mock_ak_hist.call_count == 2
+    assert mock_ak_hist.call_args.kwargs['adjust'] == 'hfq'
+    assert mock_ak_hist.call_args.kwargs['start_date'] == '20240226'
+    assert mock_ak_hist.call_args.kwargs['end_date'] == '20240301'
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_batch_historical_data(mock_ak_hist, adapter, mock_daily_data, tmp_cache):
+    """Test batch retrieval with duplicate symbols and a partially warm cache."""
+    mock_ak_hist.return_value = mock_daily_data
+
+    await adapter.get_batch_historical_data(['600000.SH'], Period.DAILY, '20240201', '20240229')
+    df = await adapter.get_batch_historical_data(
+        ['000001.SZ', '600000.SH', '000001.SZ'], Period.DAILY, '20240201', '20240229'
+    )
+
+    assert len(df) == 4
+    assert df['open'].dtype == 'float32'
+    assert df['volume'].dtype == 'int64'
+    assert df['amount'].dtype == 'float64'
+    assert isinstance(df['symbol'].dtype, pd.CategoricalDtype)
+    assert list(df['symbol'].cat.categories) == ['000001.SZ', '600000.SH']
+    assert df['symbol'].tolist() == ['000001.SZ'] * 2 + ['600000.SH'] * 2
+    assert mock_ak_hist.call_count == 2
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_historical_data_batch(mock_ak_hist, adapter, mock_daily_data, tmp_cache):
+    """Test batch retrieval returns one frame per symbol in input order and caches misses."""
+    mock_ak_hist.return_value = mock_daily_data
+    symbols = ['000001.SZ', '600000.SH']
+
+    data = await adapter.get_historical_data_batch(symbols, Period.DAILY, '20240201', '20240229')
+    cached = await adapter.get_historical_data_batch(symbols[::-1], Period.DAILY, '20240201', '20240229')
+
+    assert list(data) == symbols
+    assert [df['symbol'].iloc[0] for df in data.values()] == symbols
+    assert list(cached) == symbols[::-1]
+    assert mock_ak_hist.call_count == 2
+
+    # A different adjustment misses the qfq entries and is cached on its own
+    await adapter.get_historical_data_batch(symbols, Period.DAILY, '20240201', '20240229', adjust_type='hfq')
+    await adapter.get_historical_data_batch(symbols, Period.DAILY, '20240201', '20240229', adjust_type='hfq')
+
+    assert mock_ak_hist.call_count == 4
+    assert mock_ak_hist.call_args.kwargs['adjust'] == 'hfq'
+
+
+@patch('akshare.stock_zh_a_hist')
+async def test_get_batch_historical_data_datetime_range(mock_ak_hist, adapter, mock_daily_data, tmp_cache):
+    """Test that datetime bounds are formatted once and passed to AKShare as YYYYMMDD."""
+    mock_ak_hist.return_value = mock_daily_data
+
+    await adapter.get_batch_historical_data(
+        ['000001.SZ', '600000.SH'], Period.DAILY, datetime(2024, 2, 1), datetime(2024, 2, 29)
+    )
+
+    for call in mock_ak_hist.call_args_list:
+        assert call.kwargs['start_date'] == '20240201'
+        assert call.kwargs['end_date'] == '20240229'
+
+
+def test_install_http_session_only_patches_akshare(monkeypatch):
+    """Test that the pooled session replaces requests inside akshare modules only."""
+    import sys
+    import types
+    import requests
+    from src.data.adapters import akshare_adapter
+
+    module = types.ModuleType('akshare._pooled_session_probe')
+    module.requests = requests
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setattr(akshare_adapter, '_pooled_requests', None)
+    original_get = requests.get
+
+    akshare_adapter._install_http_session(pool_size=2, retry_count=0, retry_delay=0)
+
+    assert module.requests is akshare_adapter._pooled_requests
+    assert module.requests.Session is requests.Session
+    assert requests.get is original_get
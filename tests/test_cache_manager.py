@@ -0,0 +1,75 @@
+"""
+Tests for the SQLite cache manager.
+"""
+import pytest
+import pandas as pd
+from src.data.cache.cache_manager import CacheManager
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache manager backed by a temporary directory."""
+    return CacheManager(cache_dir=str(tmp_path))
+
+
+def make_frame(symbol):
+    """Build a small normalized history frame for a symbol."""
+    return pd.DataFrame({
+        'date': ['20240228', '20240229'],
+        'open': [10.0, 10.1],
+        'close': [10.2, 10.3],
+        'volume': [1000000, 1100000],
+        'symbol': [symbol, symbol]
+    })
+
+
+def test_save_and_get_data(cache):
+    """Test single-entry round trip."""
+    df = make_frame('000001.SZ')
+    assert cache.save_data('000001.SZ', 'daily', '20240201', '20240229', df)
+
+    cached = cache.get_data('000001.SZ', 'daily', '20240201', '20240229')
+    pd.testing.assert_frame_equal(cached, df)
+    assert cache.get_data('000001.SZ', 'weekly', '20240201', '20240229') is None
+
+
+def test_batch_data(cache):
+    """Test batch lookups split hits and misses in request order."""
+    symbols = ['000001.SZ', '600000.SH', '000002.SZ']
+    cache.save_batch_data(
+        symbols[:2], 'daily', '20240201', '20240229',
+        [make_frame(s) for s in symbols[:2]]
+    )
+
+    missed, cached = cache.get_batch_data(symbols[::-1], 'daily', '20240201', '20240229')
+
+    assert missed == ['000002.SZ']
+    assert [df['symbol'].iloc[0] for df in cached] == ['600000.SH', '000001.SZ']
+
+
+def test_data_persists_across_connections(tmp_path):
+    """Test that committed writes are visible after reopening the cache."""
+    df = make_frame('000001.SZ')
+    first = CacheManager(cache_dir=str(tmp_path))
+    first.save_data('000001.SZ', 'daily', '20240201', '20240229', df)
+    first.close()
+
+    second = CacheManager(cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(
+        second.get_data('000001.SZ', 'daily', '20240201', '20240229'), df
+    )
+    assert second.clear_expired() == 0
+    second.close()
+
+
+def test_entries_are_keyed_by_adjust_type(cache):
+    """Test that the same window is cached separately per adjustment type."""
+    qfq = make_frame('000001.SZ')
+    hfq = qfq.assign(open=[20.0, 20.2])
+    cache.save_data('000001.SZ', 'daily', '20240201', '20240229', qfq, 'qfq')
+    cache.save_data('000001.SZ', 'daily', '20240201', '20240229', hfq, 'hfq')
+
+    pd.testing.assert_frame_equal(cache.get_data('000001.SZ', 'daily', '20240201', '20240229', 'qfq'), qfq)
+    pd.testing.assert_frame_equal(cache.get_data('000001.SZ', 'daily', '20240201', '20240229', 'hfq'), hfq)
+    assert cache.get_data('000001.SZ', 'daily', '20240201', '20240229', '') is None
+    assert cache.get_overlapping_data('000001.SZ', 'daily', '20240201', '20240301', '') is None
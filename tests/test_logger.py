@@ -1,7 +1,14 @@
 """
 Test the logging system.
 """
-from src.utils.logger import log
+import gzip
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from loguru import logger
+from src.utils import logger as logger_module
+from src.utils.logger import log, setup_logger, _gzip_compress
 
 def test_logger():
     """Test basic logging functionality."""
@@ -13,3 +20,50 @@ def test_logger():
     except Exception as e:
         log.error(f"Error message: {str(e)}")
         log.exception("Exception details")
+
+
+def test_warnings_reach_disk_immediately(tmp_path, monkeypatch):
+    """Test that warnings are written to the error log without waiting for a flush."""
+    monkeypatch.setattr(logger_module, "BASE_DIR", str(tmp_path))
+    monkeypatch.setattr(logger_module, "_LOGDIR_READY", False)
+    try:
+        setup_logger(force=True)
+        log.warning("Durable warning message")
+        log.info("Info stays out of the error log")
+
+        content = (tmp_path / "logs" / "error.log").read_text(encoding="utf-8")
+        assert "Durable warning message" in content
+        assert "Info stays out of the error log" not in content
+    finally:
+        monkeypatch.undo()
+        setup_logger(force=True)
+
+
+def test_gzip_compress(tmp_path):
+    """Test that rotated logs are gzipped and the original removed."""
+    path = tmp_path / "app.log"
+    path.write_text("line\n" * 100)
+
+    _gzip_compress(str(path))
+
+    assert not path.exists()
+    with gzip.open(str(path) + ".gz", "rt") as f:
+        assert f.read() == "line\n" * 100
+
+
+def test_logger_import_is_lightweight():
+    """Test that importing the logger does not pull in pandas or numpy."""
+    code = (
+        "import sys; from src.utils.logger import log; "
+        "assert 'pandas' not in sys.modules and 'numpy' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parent.parent)
+
+
+def test_setup_logger_is_idempotent():
+    """Test that repeated setup calls do not re-register sinks."""
+    setup_logger()
+    with patch.object(logger, "remove") as remove, patch.object(logger, "add") as add:
+        assert setup_logger() is logger
+    remove.assert_not_called()
+    add.assert_not_called()
@@ -7,49 +7,63 @@ import pandas as pd
 import numpy as np
 from src.data.models import MarketData, StockInfo, DataValidator
 
-def test_market_data_creation():
+def test_market_data_creation(now):
     """Test MarketData instance creation."""
-    data = {
-        'symbol': '000001.SZ',
-        'market': 'CN',
-        'timestamp': datetime.now(),
-        'open': 10.0,
-        'high': 11.0,
-        'low': 9.0,
-        'close': 10.5,
-        'volume': 1000000,
-        'amount': 10500000.0
-    }
-    
-    market_data = MarketData.from_dict(data)
+    market_data = MarketData(
+        symbol='000001.SZ',
+        market='CN',
+        timestamp=now,
+        open=10.0,
+        high=11.0,
+        low=9.0,
+        close=10.5,
+        volume=1000000,
+        amount=10500000.0
+    )
     assert market_data.symbol == '000001.SZ'
     assert market_data.market == 'CN'
     assert isinstance(market_data.timestamp, datetime)
     assert market_data.open == 10.0
 
-def test_stock_info_creation():
+def test_stock_info_creation(now):
     """Test StockInfo instance creation."""
+    stock_info = StockInfo(
+        symbol='000001.SZ',
+        name='Test Stock',
+        market='CN',
+        industry='Technology',
+        list_date=now,
+        is_active=True
+    )
+    assert stock_info.symbol == '000001.SZ'
+    assert stock_info.name == 'Test Stock'
+    assert stock_info.industry == 'Technology'
+
+def test_from_dict_round_trip(now):
+    """Test that from_dict and to_dict round-trip model fields."""
     data = {
         'symbol': '000001.SZ',
-        'name': 'Test Stock',
         'market': 'CN',
-        'industry': 'Technology',
-        'list_date': datetime.now(),
-        'is_active': True
+        'timestamp': now,
+        'open': 10.0,
+        'high': 11.0,
+        'low': 9.0,
+        'close': 10.5,
+        'volume': 1000000,
+        'amount': 10500000.0
     }
+    assert MarketData.from_dict(data).to_dict() == data
     
-    stock_info = StockInfo.from_dict(data)
-    assert stock_info.symbol == '000001.SZ'
-    assert stock_info.name == 'Test Stock'
-    assert stock_info.industry == 'Technology'
+    stock_info = StockInfo.from_dict({'symbol': '000001.SZ', 'name': 'Test Stock', 'market': 'CN'})
+    assert stock_info == StockInfo(symbol='000001.SZ', name='Test Stock', market='CN')
 
-def test_data_validator():
+def test_data_validator(now):
     """Test DataValidator functionality."""
     # Create valid test data
     valid_data = pd.DataFrame({
         'symbol': ['000001.SZ'],
         'market': ['CN'],
-        'timestamp': [datetime.now()],
+        'timestamp': [now],
         'open': [10.0],
         'high': [11.0],
         'low': [9.0],
@@ -58,18 +72,20 @@ def test_data_validator():
         'amount': [10500000.0]
     })
     
-    assert DataValidator.validate_market_data(valid_data) == True
+    assert DataValidator.validate_market_data(valid_data) is True
     
     # Test with invalid data (negative prices)
-    invalid_data = valid_data.copy()
-    invalid_data['close'] = -10.0
-    assert DataValidator.validate_market_data(invalid_data) == False
+    assert DataValidator.validate_market_data(valid_data.assign(close=-10.0)) is False
     
     # Test with missing columns
-    invalid_data = valid_data.drop('volume', axis=1)
-    assert DataValidator.validate_market_data(invalid_data) == False
+    missing_volume = pd.DataFrame({c: valid_data[c] for c in valid_data.columns if c != 'volume'})
+    assert DataValidator.validate_market_data(missing_volume) is False
     
     # Test with null values
-    invalid_data = valid_data.copy()
-    invalid_data.loc[0, 'close'] = np.nan
-    assert DataValidator.validate_market_data(invalid_data) == False
+    assert DataValidator.validate_market_data(valid_data.assign(close=np.nan)) is False
+
+def test_models_are_immutable():
+    """Test that model instances cannot be modified after creation."""
+    stock_info = StockInfo(symbol='000001.SZ', name='Test Stock', market='CN')
+    with pytest.raises(AttributeError):
+        stock_info.name = 'Other'